@@ -8,42 +8,92 @@ dinâmicas e análises avançadas.
 
 import os
 import sys
+import json
+from functools import lru_cache
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype, is_string_dtype
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, html, dcc, dash_table, callback, Output, Input, State
+import plotly.io as pio
+from dash import Dash, DiskcacheManager, html, dcc, dash_table, callback, callback_context, Output, Input, State
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
+import diskcache
 from dash_bootstrap_templates import load_figure_template
 from dash.exceptions import PreventUpdate
 import numpy as np
-import re
 from datetime import datetime
 import pycountry
 import plotly.colors as pc
-import colorsys
 
 # Adicionar o diretório pai ao sys.path para permitir importações relativas
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.mongo_manager import MongoDBManager
+from src.filtro_tabela import aplicar_filtro_tabela
 
 # Carregar o template para gráficos
 load_figure_template("DARKLY")
 
+# Serializar as figuras com orjson (bem mais rápido que o módulo json padrão)
+pio.json.config.default_engine = 'orjson'
+
 # Função para gerar paleta de cores personalizada
 def gerar_paleta_cores(n_cores):
     """Gera uma paleta de cores vibrantes e harmoniosas"""
-    paleta = []
-    for i in range(n_cores):
-        # Usar HSV para criar cores bem distribuídas (matiz, saturação, valor)
-        h = i/n_cores  # Matiz uniformemente distribuída
-        s = 0.7  # Saturação alta para cores vibrantes
-        v = 0.9  # Valor alto para cores brilhantes
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        # Converter para formato hexadecimal usado pelo Plotly
-        color = f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
-        paleta.append(color)
-    return paleta
+    # Usar HSV para criar cores bem distribuídas (matiz, saturação, valor)
+    h = np.arange(n_cores) / n_cores  # Matiz uniformemente distribuída
+    s = 0.7  # Saturação alta para cores vibrantes
+    v = 0.9  # Valor alto para cores brilhantes
+    
+    # Conversão HSV -> RGB vetorizada (mesmas fórmulas de colorsys.hsv_to_rgb)
+    indice_matiz = (h * 6.0).astype(int)
+    f = h * 6.0 - indice_matiz
+    p = np.full(n_cores, v * (1.0 - s))
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    v = np.full(n_cores, v)  # Broadcast do valor constante para o empilhamento abaixo
+    componentes = np.stack([
+        np.stack([v, t, p], axis=1),
+        np.stack([q, v, p], axis=1),
+        np.stack([p, v, t], axis=1),
+        np.stack([p, q, v], axis=1),
+        np.stack([t, p, v], axis=1),
+        np.stack([v, p, q], axis=1),
+    ])
+    rgb = (componentes[indice_matiz % 6, np.arange(n_cores)] * 255).astype(np.uint8)
+    
+    # Converter para formato hexadecimal usado pelo Plotly
+    return ['#%02x%02x%02x' % tuple(cor) for cor in rgb]
+
+# Função para ler um arquivo local reaproveitando uma cópia em Parquet
+def ler_com_cache_parquet(caminho_arquivo, leitor):
+    """
+    Lê um arquivo de dados local, usando uma cópia em Parquet quando ela for mais recente que o original
+    
+    Args:
+        caminho_arquivo (str): Caminho do arquivo Excel/CSV de origem
+        leitor (callable): Função que lê o arquivo de origem e retorna um DataFrame
+        
+    Returns:
+        pandas.DataFrame: DataFrame com os dados do arquivo
+    """
+    caminho_cache = caminho_arquivo + '.parquet'
+    if os.path.exists(caminho_cache) and os.path.getmtime(caminho_cache) >= os.path.getmtime(caminho_arquivo):
+        try:
+            return pd.read_parquet(caminho_cache, engine='pyarrow', memory_map=True)
+        except Exception as e:
+            print(f"Erro ao ler cache Parquet: {str(e)}")
+    
+    df = leitor(caminho_arquivo)
+    
+    # Salvar a cópia em Parquet para as próximas inicializações (requer pyarrow)
+    try:
+        df.to_parquet(caminho_cache, engine='pyarrow', compression='zstd', index=False)
+    except Exception as e:
+        print(f"Não foi possível salvar o cache Parquet: {str(e)}")
+    
+    return df
 
 # Função para carregar dados do MongoDB ou dos arquivos locais
 def carregar_dados():
@@ -56,25 +106,28 @@ def carregar_dados():
     try:
         # Primeiro tenta carregar do MongoDB
         mongo_manager = MongoDBManager()
-        dados = mongo_manager.buscar_todos()
+        dados = mongo_manager.buscar_todos_df()
         mongo_manager.close()
         
-        if dados:
-            return pd.DataFrame(dados)
+        if not dados.empty:
+            return dados
         else:
             # Se não conseguir, tenta carregar do arquivo Excel
             diretorio_data = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
             caminho_excel = os.path.join(diretorio_data, 'dados_empresas.xlsx')
             
             if os.path.exists(caminho_excel):
-                df = pd.read_excel(caminho_excel)
+                df = ler_com_cache_parquet(caminho_excel, pd.read_excel)
                 print("Carregou do Excel. Colunas:", df.columns.tolist())
                 return df
             else:
                 # Se não encontrar o Excel, tenta o CSV
                 caminho_csv = os.path.join(diretorio_data, 'dados_empresas.csv')
                 if os.path.exists(caminho_csv):
-                    df = pd.read_csv(caminho_csv, sep=';', encoding='utf-8-sig')
+                    df = ler_com_cache_parquet(
+                        caminho_csv,
+                        lambda caminho: pd.read_csv(caminho, sep=';', encoding='utf-8-sig')
+                    )
                     print("Carregou do CSV. Colunas:", df.columns.tolist())
                     return df
                 else:
@@ -83,18 +136,31 @@ def carregar_dados():
         print(f"Erro ao carregar dados: {str(e)}")
         return pd.DataFrame()
 
-def converter_para_float(valor):
+# Caracteres removidos dos valores monetários: R$, espaços e pontos de milhar
+_PADRAO_LIMPEZA_MOEDA = r'[R$.\s\v\xa0]'
+
+def _limpar_textos_moeda(textos):
+    """Remove os símbolos de milhar e de moeda e troca a vírgula decimal por ponto"""
+    # No dtype str (pyarrow) as substituições por regex rodam em código nativo, sem laço Python
+    textos = textos.astype('str')
+    return textos.str.replace(_PADRAO_LIMPEZA_MOEDA, '', regex=True).str.replace(',', '.', regex=False)
+
+def _to_float_series(serie):
     """
-    Converte um valor monetário em string para float
+    Converte uma coluna de valores monetários em string para float de forma vetorizada
     """
-    if isinstance(valor, (int, float)):
-        return float(valor)
-    elif isinstance(valor, str):
-        # Remove R$, espaços e converte vírgulas para pontos
-        limpo = re.sub(r'[R$\s.]', '', valor).replace(',', '.')
-        return float(limpo)
-    else:
-        return np.nan
+    # Coluna só de textos (caso usual ao ler do Excel/MongoDB): limpar a coluna inteira de uma vez
+    if is_string_dtype(serie):
+        return pd.to_numeric(_limpar_textos_moeda(serie), errors='coerce')
+    
+    # Coluna mista: apenas os textos são limpos e os valores já numéricos passam inalterados
+    # (remover os pontos de um float como 274481453.2 corromperia o valor)
+    textos = serie.map(type) == str
+    resultado = pd.to_numeric(serie.where(~textos), errors='coerce')
+    if textos.any():
+        limpo = _limpar_textos_moeda(serie[textos])
+        resultado[textos] = pd.to_numeric(limpo, errors='coerce')
+    return resultado
 
 def normalizar_colunas(df):
     """
@@ -119,10 +185,31 @@ def normalizar_colunas(df):
     if colunas_para_renomear:
         df = df.rename(columns=colunas_para_renomear)
     
+    # Converter valores numéricos vindos como texto (CSV/Excel) antes de calcular as colunas derivadas;
+    # colunas que já são numéricas (MongoDB, cache Parquet) não são percorridas
+    if 'receita_anual' in df.columns and not is_numeric_dtype(df['receita_anual']):
+        df['receita_anual'] = _to_float_series(df['receita_anual'])
+    if 'numero_funcionarios' in df.columns and not is_numeric_dtype(df['numero_funcionarios']):
+        df['numero_funcionarios'] = pd.to_numeric(df['numero_funcionarios'], errors='coerce')
+    
     # Verificar se a coluna ano_fundacao existe, caso contrário tentar criá-la
     if 'ano_fundacao' not in df.columns and 'data_fundacao' in df.columns:
         try:
-            df['data_fundacao'] = pd.to_datetime(df['data_fundacao'])
+            # Datas gravadas como BSON Date já chegam como datetime; para textos (coleções antigas,
+            # planilhas), o formato explícito evita a inferência linha a linha
+            if not is_datetime64_any_dtype(df['data_fundacao']):
+                originais = df['data_fundacao']
+                datas = pd.to_datetime(originais, format='%Y-%m-%d', errors='coerce')
+                
+                # Datas fora do formato ISO (ex.: 15/03/1998) são reinterpretadas uma a uma,
+                # apenas nas linhas em que a primeira passada falhou
+                falhas = datas.isna() & originais.notna()
+                if falhas.any():
+                    datas[falhas] = pd.to_datetime(originais[falhas], format='mixed', dayfirst=True, errors='coerce')
+                    nao_interpretadas = int((datas.isna() & originais.notna()).sum())
+                    if nao_interpretadas:
+                        print(f"Atenção: {nao_interpretadas} datas de fundação não puderam ser interpretadas")
+                df['data_fundacao'] = datas
             df['ano_fundacao'] = df['data_fundacao'].dt.year
         except:
             print("Não foi possível extrair o ano da data de fundação")
@@ -134,9 +221,12 @@ def normalizar_colunas(df):
     
     # Categorizar empresas por faixa de receita
     if 'receita_anual' in df.columns:
-        bins = [0, 10e6, 100e6, 500e6, 1e9, float('inf')]
+        bins = np.array([0, 10e6, 100e6, 500e6, 1e9, np.inf])
         labels = ['Micro', 'Pequena', 'Média', 'Grande', 'Corporação']
-        df['porte'] = pd.cut(df['receita_anual'], bins=bins, labels=labels)
+        # Intervalos fechados à direita, como em pd.cut; valores fora das faixas (ou NaN) ficam com código -1
+        codigos = np.searchsorted(bins, df['receita_anual'].to_numpy(dtype=float), side='left') - 1
+        codigos[codigos >= len(labels)] = -1
+        df['porte'] = pd.Categorical.from_codes(codigos, categories=labels, ordered=True)
     
     # Idade da empresa em anos
     if 'ano_fundacao' in df.columns:
@@ -146,6 +236,7 @@ def normalizar_colunas(df):
     return df
 
 # Busca o código ISO alpha-3 do país (para o mapa)
+@lru_cache(maxsize=None)
 def obter_codigo_pais(nome_pais):
     try:
         pais = pycountry.countries.search_fuzzy(nome_pais)
@@ -161,14 +252,20 @@ df = carregar_dados()
 # Normalizar os nomes das colunas
 df = normalizar_colunas(df)
 
-# Verificar se há colunas específicas para formatação
-if 'receita_anual' in df.columns:
-    # Converter valores para float
-    df['receita_anual'] = df['receita_anual'].apply(converter_para_float)
-
 # Adicionar códigos ISO para países (útil para mapas)
 if 'pais' in df.columns:
-    df['codigo_pais'] = df['pais'].apply(obter_codigo_pais)
+    # A busca fuzzy é feita uma única vez por país distinto
+    mapa_codigos_pais = {pais: obter_codigo_pais(pais) for pais in df['pais'].dropna().unique()}
+    df['codigo_pais'] = df['pais'].map(mapa_codigos_pais)
+
+# Reduzir os tipos das colunas para diminuir o volume de memória percorrido em filtros e agregações
+if 'numero_funcionarios' in df.columns:
+    df['numero_funcionarios'] = pd.to_numeric(df['numero_funcionarios'], downcast='unsigned')
+if 'ano_fundacao' in df.columns:
+    df['ano_fundacao'] = pd.to_numeric(df['ano_fundacao'], downcast='integer')
+for coluna in ['setor', 'pais', 'codigo_pais', 'porte']:
+    if coluna in df.columns:
+        df[coluna] = df[coluna].astype('category')
 
 # Criar paleta de cores personalizada para os setores
 setores_unicos = df['setor'].unique()
@@ -181,6 +278,36 @@ for col in colunas_obrigatorias:
     if col not in df.columns:
         print(f"Atenção: Coluna {col} não encontrada no DataFrame. Colunas disponíveis: {df.columns.tolist()}")
 
+# Arrays NumPy das colunas usadas nos filtros, materializados uma única vez
+valores_receita = df['receita_anual'].to_numpy()
+valores_funcionarios = df['numero_funcionarios'].to_numpy()
+valores_ano = df['ano_fundacao'].to_numpy()
+
+# Colunas categóricas como códigos inteiros (-1 para valores ausentes)
+codigos_setor, setores_codificados = pd.factorize(df['setor'])
+codigos_porte, portes_codificados = pd.factorize(df['porte'])
+setores_codificados = pd.Index(setores_codificados)
+portes_codificados = pd.Index(portes_codificados)
+
+def mascara_por_codigos(codigos, categorias, selecionados):
+    """Equivalente a Series.isin comparando os códigos inteiros das categorias"""
+    indices = categorias.get_indexer(selecionados)
+    return np.isin(codigos, indices[indices >= 0])
+
+# Agregados parciais por setor/porte (e por ano), calculados uma única vez
+estatisticas_grupos = df.groupby(['setor', 'porte'], observed=True, dropna=False).agg(
+    contagem=('receita_anual', 'size'),
+    receita_soma=('receita_anual', 'sum'),
+    funcionarios_soma=('numero_funcionarios', 'sum')
+)
+fundacoes_grupos = df.groupby(['ano_fundacao', 'setor', 'porte'], observed=True, dropna=False).size()
+
+# Portes disponíveis, usados como seleção padrão do checklist
+portes_todos = df['porte'].unique().tolist()
+
+# Anos de fundação distintos, em ordem crescente
+anos_ordenados = np.sort(df['ano_fundacao'].dropna().unique())
+
 # Definir valores padrão para uso nos sliders
 receita_max = 1000
 if 'receita_anual' in df.columns:
@@ -188,21 +315,43 @@ if 'receita_anual' in df.columns:
 
 funcionarios_max = 500
 if 'numero_funcionarios' in df.columns:
-    funcionarios_max = df['numero_funcionarios'].max()
+    funcionarios_max = int(df['numero_funcionarios'].max())
 
 ano_min = 1970
 ano_max = 2025
-if 'ano_fundacao' in df.columns:
-    ano_min = df['ano_fundacao'].min()
-    ano_max = df['ano_fundacao'].max()
+if 'ano_fundacao' in df.columns and df['ano_fundacao'].notna().any():
+    ano_min = int(df['ano_fundacao'].min())
+    ano_max = int(df['ano_fundacao'].max())
 
 # Criar marcações para os sliders
 receita_marks = {i: f'{i}M' for i in range(0, receita_max + 100, 100)}
 funcionarios_marks = {i: str(i) for i in range(0, funcionarios_max + 100, 100)}
 ano_marks = {i: str(i) for i in range(ano_min, ano_max + 1, 5)}
 
+# Gerenciador de callbacks em segundo plano: executa cálculos pesados em outro processo,
+# liberando a thread que atende as requisições
+diretorio_cache = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+gerenciador_background = DiskcacheManager(diskcache.Cache(diretorio_cache))
+
 # Inicializar o app Dash com tema escuro Bootstrap
-app = Dash(__name__, external_stylesheets=[dbc.themes.DARKLY])
+app = Dash(
+    __name__,
+    external_stylesheets=[dbc.themes.DARKLY],
+    background_callback_manager=gerenciador_background
+)
+
+# Assinatura dos dados carregados (quantidade de linhas e hash do conteúdo): processos que
+# carregaram os mesmos dados compartilham as entradas do cache, e dados diferentes nunca
+# reaproveitam figuras calculadas sobre outra carga
+assinatura_dados = f"{len(df)}-{int(pd.util.hash_pandas_object(df, index=False).sum()):x}"
+
+# Cache em disco para as saídas dos callbacks, separado por assinatura dos dados
+cache = Cache(app.server, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': os.path.join(diretorio_cache, 'figuras'),
+    'CACHE_DEFAULT_TIMEOUT': 3600,
+    'CACHE_KEY_PREFIX': f'dados-{assinatura_dados}-'
+})
 
 # Navbar superior
 navbar = dbc.NavbarSimple(
@@ -248,6 +397,17 @@ def criar_card_metrica(titulo, valor, subtitulo, icone, cor):
         style={"border-left": f"4px solid {cor}"}
     )
 
+# Colunas exibidas na tabela de dados detalhados
+colunas_tabela = {
+    'nome_empresa': 'Nome da Empresa',
+    'setor': 'Setor',
+    'receita_anual': 'Receita Anual',
+    'numero_funcionarios': 'Nº Funcionários',
+    'pais': 'País',
+    'ano_fundacao': 'Ano Fundação',
+    'porte': 'Porte'
+}
+
 # Layout do dashboard
 app.layout = html.Div([
     navbar,
@@ -308,7 +468,7 @@ app.layout = html.Div([
                                 html.Label("Selecione o Setor:", className="font-weight-bold mt-2"),
                                 dcc.Dropdown(
                                     id='setor-dropdown',
-                                    options=[{'label': setor, 'value': setor} for setor in df['setor'].unique()],
+                                    options=[{'label': setor, 'value': setor} for setor in setores_unicos],
                                     value=[],
                                     multi=True,
                                     className="mb-3"
@@ -350,8 +510,8 @@ app.layout = html.Div([
                                 html.Label("Porte da Empresa:", className="font-weight-bold"),
                                 dcc.Checklist(
                                     id='porte-checklist',
-                                    options=[{'label': p, 'value': p} for p in df['porte'].unique()],
-                                    value=df['porte'].unique().tolist(),
+                                    options=[{'label': p, 'value': p} for p in portes_todos],
+                                    value=portes_todos,
                                     inline=True,
                                     className="mb-3"
                                 ),
@@ -462,7 +622,42 @@ app.layout = html.Div([
                                 ], className="d-flex justify-content-between")
                             ]),
                             dbc.CardBody([
-                                html.Div(id='tabela-dados')
+                                dash_table.DataTable(
+                                    id='tabela',
+                                    columns=[
+                                        {"name": nome, "id": coluna, "type": "numeric" if coluna in ('numero_funcionarios', 'ano_fundacao') else "text"}
+                                        for coluna, nome in colunas_tabela.items()
+                                    ],
+                                    style_table={'overflowX': 'auto'},
+                                    style_header={
+                                        'backgroundColor': '#2C3E50',
+                                        'color': 'white',
+                                        'fontWeight': 'bold',
+                                        'border': '1px solid #222'
+                                    },
+                                    style_cell={
+                                        'backgroundColor': '#1E293B',
+                                        'color': 'white',
+                                        'border': '1px solid #222',
+                                        'padding': '8px',
+                                        'textAlign': 'left'
+                                    },
+                                    style_data_conditional=[
+                                        {
+                                            'if': {'row_index': 'odd'},
+                                            'backgroundColor': '#172331'
+                                        }
+                                    ],
+                                    # Paginação, ordenação e filtro feitos no servidor: só a página atual é enviada
+                                    page_current=0,
+                                    page_size=10,
+                                    page_action="custom",
+                                    filter_action="custom",
+                                    filter_query='',
+                                    sort_action="custom",
+                                    sort_mode="multi",
+                                    sort_by=[]
+                                )
                             ])
                         ], className="shadow")
                     ], width=12),
@@ -561,6 +756,12 @@ app.layout = html.Div([
             ]),
         ], id="tabs-principal", active_tab="visao-geral"),
         
+        # Disparo dos insights: só muda ao abrir a aba de insights
+        dcc.Store(id='gatilho-insights'),
+        
+        # Filtros do painel no momento do último "Aplicar Filtros"
+        dcc.Store(id='filtros-aplicados'),
+        
         # Rodapé
         html.Footer([
             html.Hr(),
@@ -581,7 +782,7 @@ app.layout = html.Div([
      Output('grafico-top-empresas', 'figure'),
      Output('grafico-scatter', 'figure'),
      Output('resumo-selecao', 'children'),
-     Output('tabela-dados', 'children')],
+     Output('filtros-aplicados', 'data')],
     [Input('aplicar-filtros-btn', 'n_clicks')],
     [State('setor-dropdown', 'value'),
      State('receita-slider', 'value'),
@@ -591,175 +792,297 @@ app.layout = html.Div([
      State('top-n-slider', 'value')]
 )
 def update_graficos(n_clicks, setores_selecionados, faixa_receita, faixa_funcionarios, faixa_ano, porte_selecionado, top_n):
-    # Filtrar o dataframe com base nos inputs
-    dff = df.copy()
+    # Listas não são hashable: converter para tuplas para compor a chave do cache
+    saidas = calcular_graficos(
+        tuple(setores_selecionados or ()),
+        tuple(faixa_receita),
+        tuple(faixa_funcionarios),
+        tuple(faixa_ano),
+        tuple(porte_selecionado or ()),
+        top_n
+    )
+    
+    # As figuras ficam em cache já serializadas; o Dash aceita o dicionário diretamente
+    figuras = [json.loads(figura) for figura in saidas[:6]]
+    
+    # Filtros efetivamente aplicados: a tabela usa estes, e não os controles ainda não aplicados
+    filtros_aplicados = {
+        'setores': setores_selecionados,
+        'receita': faixa_receita,
+        'funcionarios': faixa_funcionarios,
+        'ano': faixa_ano,
+        'porte': porte_selecionado
+    }
+    return (*figuras, *saidas[6:], filtros_aplicados)
+
+def filtrar_dados(setores_selecionados, faixa_receita, faixa_funcionarios, faixa_ano, porte_selecionado):
+    """
+    Aplica os filtros do painel ao dataframe
+    
+    Returns:
+        tuple: DataFrame filtrado e indicador de que as faixas numéricas não excluíram nenhuma linha
+    """
+    # Combinar todos os filtros em uma única máscara booleana e indexar o dataframe uma só vez
+    mascara = np.ones(len(df), dtype=bool)
     
     # Filtrar por setor se algum for selecionado
     if setores_selecionados:
-        dff = dff[dff['setor'].isin(setores_selecionados)]
+        mascara &= mascara_por_codigos(codigos_setor, setores_codificados, setores_selecionados)
     
     # Filtrar por faixa de receita (convertendo para milhões)
-    dff = dff[(dff['receita_anual'] >= faixa_receita[0] * 1e6) & 
-              (dff['receita_anual'] <= faixa_receita[1] * 1e6)]
+    mascara_faixas = (valores_receita >= faixa_receita[0] * 1e6) & (valores_receita <= faixa_receita[1] * 1e6)
     
     # Filtrar por faixa de funcionários
-    dff = dff[(dff['numero_funcionarios'] >= faixa_funcionarios[0]) & 
-              (dff['numero_funcionarios'] <= faixa_funcionarios[1])]
+    mascara_faixas &= (valores_funcionarios >= faixa_funcionarios[0]) & (valores_funcionarios <= faixa_funcionarios[1])
     
     # Filtrar por faixa de ano de fundação
-    dff = dff[(dff['ano_fundacao'] >= faixa_ano[0]) & 
-              (dff['ano_fundacao'] <= faixa_ano[1])]
+    mascara_faixas &= (valores_ano >= faixa_ano[0]) & (valores_ano <= faixa_ano[1])
+    mascara &= mascara_faixas
     
     # Filtrar por porte
     if porte_selecionado:
-        dff = dff[dff['porte'].isin(porte_selecionado)]
+        mascara &= mascara_por_codigos(codigos_porte, portes_codificados, porte_selecionado)
     
-    # Criar gráfico de pizza com design aprimorado
-    contagem_setor = dff['setor'].value_counts().reset_index()
-    contagem_setor.columns = ['setor', 'contagem']
-    
-    fig_pizza = px.pie(
-        contagem_setor, 
-        values='contagem', 
-        names='setor',
-        color='setor',
-        color_discrete_map=mapa_cores_setores,
-        hole=0.4,
-        template="plotly_dark"
+    return df.loc[mascara], mascara_faixas.all()
+
+def agregar_por_setor(dff, setores_selecionados, porte_selecionado, faixas_completas):
+    """
+    Calcula contagem, receita média e média de funcionários por setor e as fundações por ano/setor
+    
+    Quando os sliders não excluem nenhuma linha, os valores são derivados dos agregados
+    pré-calculados, restritos aos setores e portes selecionados, sem reagrupar o dataframe.
+    
+    Returns:
+        tuple: DataFrame indexado por setor e DataFrame com a contagem por ano e setor
+    """
+    if not faixas_completas:
+        # Contagens e somas por setor com bincount sobre os códigos da categoria
+        categorias = dff['setor'].cat.categories
+        codigos = dff['setor'].cat.codes.to_numpy()
+        validos = codigos >= 0
+        codigos = codigos[validos]
+        contagem = np.bincount(codigos, minlength=len(categorias))
+        receita_soma = np.bincount(codigos, weights=dff['receita_anual'].to_numpy()[validos], minlength=len(categorias))
+        funcionarios_soma = np.bincount(codigos, weights=dff['numero_funcionarios'].to_numpy()[validos], minlength=len(categorias))
+        
+        presentes = contagem > 0
+        por_setor = pd.DataFrame({
+            'contagem': contagem[presentes],
+            'receita_anual': receita_soma[presentes] / contagem[presentes],
+            'numero_funcionarios': funcionarios_soma[presentes] / contagem[presentes]
+        }, index=pd.Index(categorias[presentes], name='setor'))
+        fundacao_por_ano = dff.groupby(['ano_fundacao', 'setor'], observed=True).size().reset_index(name='contagem')
+        return por_setor, fundacao_por_ano
+    
+    grupos = estatisticas_grupos
+    fundacoes = fundacoes_grupos
+    if setores_selecionados:
+        grupos = grupos[grupos.index.isin(setores_selecionados, level='setor')]
+        fundacoes = fundacoes[fundacoes.index.isin(setores_selecionados, level='setor')]
+    if porte_selecionado:
+        grupos = grupos[grupos.index.isin(porte_selecionado, level='porte')]
+        fundacoes = fundacoes[fundacoes.index.isin(porte_selecionado, level='porte')]
+    
+    somas = grupos.groupby(level='setor', observed=True).sum()
+    por_setor = pd.DataFrame({
+        'contagem': somas['contagem'],
+        'receita_anual': somas['receita_soma'] / somas['contagem'],
+        'numero_funcionarios': somas['funcionarios_soma'] / somas['contagem']
+    })
+    fundacao_por_ano = fundacoes.groupby(level=['ano_fundacao', 'setor'], observed=True).sum().reset_index(name='contagem')
+    return por_setor, fundacao_por_ano
+
+# Template escuro resolvido uma única vez para as figuras montadas sem validação
+template_escuro = pio.templates['plotly_dark']
+
+# Estilos de layout compartilhados pelos gráficos
+margem_padrao = dict(t=30, b=0, l=10, r=10)
+
+def eixo_com_grade(**opcoes):
+    """Eixo com as linhas de grade discretas usadas em todo o painel"""
+    return dict(gridcolor='rgba(255,255,255,0.1)', **opcoes)
+
+def legenda_horizontal(y, **opcoes):
+    """Legenda horizontal centralizada abaixo do gráfico, na altura y"""
+    return dict(orientation="h", yanchor="bottom", y=y, xanchor="center", x=0.5, **opcoes)
+
+def figura_sem_validacao(traces, layout):
+    """
+    Monta uma figura a partir de dicionários de traces e layout, sem a validação do Plotly
+    
+    As propriedades usadas no painel principal são fixas e conhecidas, então validar cada
+    trace (como fazem o Plotly Express e o graph_objects) só acrescenta tempo ao callback.
+    
+    Returns:
+        plotly.graph_objects.Figure: Figura com o template escuro aplicado
+    """
+    return go.Figure(data=traces, layout={'template': template_escuro, **layout}, _validate=False)
+
+@cache.memoize(timeout=3600)
+def calcular_graficos(setores_selecionados, faixa_receita, faixa_funcionarios, faixa_ano, porte_selecionado, top_n):
+    """
+    Filtra os dados e constrói as figuras e componentes do painel de visão geral
+    
+    Returns:
+        tuple: Seis figuras serializadas em JSON e o resumo da seleção
+    """
+    dff, faixas_completas = filtrar_dados(
+        setores_selecionados, faixa_receita, faixa_funcionarios, faixa_ano, porte_selecionado
     )
-    fig_pizza.update_traces(
-        textinfo='percent+label', 
-        textfont_size=12,
-        marker=dict(line=dict(color='#000000', width=1.5))
+    
+    # Agregados por setor: reaproveitar os parciais pré-calculados se as faixas não cortaram linhas
+    agregados_setor, fundacao_por_ano = agregar_por_setor(
+        dff, setores_selecionados, porte_selecionado, faixas_completas
     )
-    fig_pizza.update_layout(
-        legend_title_text='Setores',
-        margin=dict(t=30, b=0, l=10, r=10),
-        legend=dict(orientation="h", yanchor="bottom", y=-0.15, xanchor="center", x=0.5)
+    
+    # Criar gráfico de pizza com design aprimorado
+    contagem_setor = agregados_setor['contagem'].sort_values(ascending=False)
+    
+    fig_pizza = figura_sem_validacao(
+        [dict(
+            type='pie',
+            labels=contagem_setor.index.tolist(),
+            values=contagem_setor.to_numpy(),
+            marker=dict(
+                colors=[mapa_cores_setores.get(setor, '#636EFA') for setor in contagem_setor.index],
+                line=dict(color='#000000', width=1.5)
+            ),
+            hole=0.4,
+            hovertemplate='setor=%{label}<br>contagem=%{value}<extra></extra>',
+            textinfo='percent+label',
+            textfont=dict(size=12)
+        )],
+        dict(
+            margin=margem_padrao,
+            legend=legenda_horizontal(-0.15, title=dict(text='Setores'), tracegroupgap=0)
+        )
     )
     
     # Criar gráfico de barras para receita média com design melhorado
-    receita_por_setor = dff.groupby('setor')['receita_anual'].mean().reset_index()
-    receita_por_setor = receita_por_setor.sort_values('receita_anual', ascending=False)
-    
-    fig_barras_receita = go.Figure()
-    for i, setor in enumerate(receita_por_setor['setor']):
-        valor = receita_por_setor.loc[receita_por_setor['setor'] == setor, 'receita_anual'].values[0]
-        fig_barras_receita.add_trace(go.Bar(
-            x=[setor],
-            y=[valor/1e6],  # Converter para milhões
-            name=setor,
-            marker_color=mapa_cores_setores.get(setor, '#636EFA'),
-            text=f"R$ {valor/1e6:.1f}M",
+    receita_por_setor = agregados_setor['receita_anual'].sort_values(ascending=False)
+    
+    # Um único trace com uma cor por barra, em vez de um trace por setor
+    receita_milhoes = receita_por_setor / 1e6  # Converter para milhões
+    fig_barras_receita = figura_sem_validacao(
+        [dict(
+            type='bar',
+            x=receita_por_setor.index.tolist(),
+            y=receita_milhoes.to_numpy(),
+            marker=dict(color=[mapa_cores_setores.get(setor, '#636EFA') for setor in receita_por_setor.index]),
+            text=receita_milhoes.map('R$ {:.1f}M'.format).tolist(),
             textposition='auto'
-        ))
-    
-    fig_barras_receita.update_layout(
-        template="plotly_dark",
-        xaxis_title="Setor",
-        yaxis_title="Receita Média (Milhões R$)",
-        showlegend=False,
-        margin=dict(t=30, b=0, l=10, r=10),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
+        )],
+        dict(
+            xaxis=dict(title=dict(text="Setor")),
+            yaxis=eixo_com_grade(title=dict(text="Receita Média (Milhões R$)")),
+            showlegend=False,
+            margin=margem_padrao
+        )
     )
     
     # Criar gráfico de barras para número médio de funcionários
-    funcionarios_por_setor = dff.groupby('setor')['numero_funcionarios'].mean().reset_index()
-    funcionarios_por_setor = funcionarios_por_setor.sort_values('numero_funcionarios', ascending=False)
-    
-    fig_barras_funcionarios = go.Figure()
-    for i, setor in enumerate(funcionarios_por_setor['setor']):
-        valor = funcionarios_por_setor.loc[funcionarios_por_setor['setor'] == setor, 'numero_funcionarios'].values[0]
-        fig_barras_funcionarios.add_trace(go.Bar(
-            x=[setor],
-            y=[valor],
-            name=setor,
-            marker_color=mapa_cores_setores.get(setor, '#636EFA'),
-            text=f"{valor:.0f}",
+    funcionarios_por_setor = agregados_setor['numero_funcionarios'].sort_values(ascending=False)
+    
+    fig_barras_funcionarios = figura_sem_validacao(
+        [dict(
+            type='bar',
+            x=funcionarios_por_setor.index.tolist(),
+            y=funcionarios_por_setor.to_numpy(),
+            marker=dict(color=[mapa_cores_setores.get(setor, '#636EFA') for setor in funcionarios_por_setor.index]),
+            text=funcionarios_por_setor.map('{:.0f}'.format).tolist(),
             textposition='auto'
-        ))
-    
-    fig_barras_funcionarios.update_layout(
-        template="plotly_dark",
-        xaxis_title="Setor",
-        yaxis_title="Média de Funcionários",
-        showlegend=False,
-        margin=dict(t=30, b=0, l=10, r=10),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
-    )
-    
-    # Criar gráfico de linha do tempo avançado
-    fundacao_por_ano = dff.groupby(['ano_fundacao', 'setor']).size().reset_index(name='contagem')
-    
-    fig_linha_tempo = px.line(
-        fundacao_por_ano,
-        x='ano_fundacao',
-        y='contagem',
-        color='setor',
-        markers=True,
-        color_discrete_map=mapa_cores_setores,
-        template="plotly_dark"
-    )
-    
-    fig_linha_tempo.update_traces(
-        line=dict(width=3),
-        marker=dict(size=8)
+        )],
+        dict(
+            xaxis=dict(title=dict(text="Setor")),
+            yaxis=eixo_com_grade(title=dict(text="Média de Funcionários")),
+            showlegend=False,
+            margin=margem_padrao
+        )
     )
     
-    fig_linha_tempo.update_layout(
-        xaxis_title="Ano de Fundação",
-        yaxis_title="Número de Empresas",
-        legend_title="Setor",
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        legend=dict(orientation="h", yanchor="bottom", y=-0.25, xanchor="center", x=0.5)
+    # Criar gráfico de linha do tempo avançado (um trace por setor, na ordem em que aparecem)
+    fig_linha_tempo = figura_sem_validacao(
+        [
+            dict(
+                type='scatter',
+                mode='lines+markers',
+                x=grupo['ano_fundacao'].to_numpy(),
+                y=grupo['contagem'].to_numpy(),
+                name=setor,
+                legendgroup=setor,
+                line=dict(color=mapa_cores_setores.get(setor, '#636EFA'), dash='solid', width=3),
+                marker=dict(symbol='circle', size=8),
+                hovertemplate=f'setor={setor}<br>ano_fundacao=%{{x}}<br>contagem=%{{y}}<extra></extra>'
+            )
+            for setor, grupo in fundacao_por_ano.groupby('setor', observed=True, sort=False)
+        ],
+        dict(
+            xaxis=eixo_com_grade(title=dict(text="Ano de Fundação")),
+            yaxis=eixo_com_grade(title=dict(text="Número de Empresas")),
+            legend=legenda_horizontal(-0.25, title=dict(text="Setor"), tracegroupgap=0),
+            margin=margem_padrao
+        )
     )
     
     # Top N empresas por receita (gráfico horizontal)
-    top_empresas = dff.sort_values('receita_anual', ascending=False).head(top_n)
-    
-    fig_top_empresas = px.bar(
-        top_empresas,
-        y='nome_empresa',
-        x='receita_anual',
-        color='setor',
-        color_discrete_map=mapa_cores_setores,
-        orientation='h',
-        template="plotly_dark",
-        labels={'receita_anual': 'Receita Anual (R$)', 'nome_empresa': 'Empresa', 'setor': 'Setor'},
-        height=500
-    )
+    top_empresas = dff.nlargest(top_n, 'receita_anual')
     
-    fig_top_empresas.update_layout(
-        yaxis={'categoryorder': 'total ascending'},
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)')
+    fig_top_empresas = figura_sem_validacao(
+        [
+            dict(
+                type='bar',
+                orientation='h',
+                x=grupo['receita_anual'].to_numpy(),
+                y=grupo['nome_empresa'].tolist(),
+                name=setor,
+                legendgroup=setor,
+                marker=dict(color=mapa_cores_setores.get(setor, '#636EFA')),
+                textposition='auto',
+                hovertemplate=f'Setor={setor}<br>Receita Anual (R$)=%{{x}}<br>Empresa=%{{y}}<extra></extra>'
+            )
+            for setor, grupo in top_empresas.groupby('setor', observed=True, sort=False)
+        ],
+        dict(
+            xaxis=eixo_com_grade(title=dict(text="Receita Anual (R$)")),
+            yaxis=dict(title=dict(text="Empresa"), categoryorder='total ascending'),
+            legend=dict(title=dict(text="Setor"), tracegroupgap=0),
+            margin=margem_padrao,
+            barmode='relative',
+            height=500
+        )
     )
     
-    # Gráfico de dispersão: receita vs funcionários
-    fig_scatter = px.scatter(
-        dff, 
-        x='numero_funcionarios', 
-        y='receita_anual',
-        size='receita_anual',
-        color='setor',
-        color_discrete_map=mapa_cores_setores,
-        hover_name='nome_empresa',
-        log_y=True,  # Escala logarítmica para melhor visualização
-        template="plotly_dark",
-        labels={
-            'numero_funcionarios': 'Número de Funcionários',
-            'receita_anual': 'Receita Anual (R$)',
-            'setor': 'Setor'
-        }
+    # Gráfico de dispersão: receita vs funcionários, com a área do ponto proporcional à receita.
+    # Os diâmetros (até 20 px) são calculados aqui em float32, em vez de enviar a receita
+    # uma segunda vez como tamanho para o navegador escalar ponto a ponto
+    dados_scatter = dff[['setor', 'nome_empresa', 'numero_funcionarios', 'receita_anual']].assign(
+        tamanho_ponto=(20 * np.sqrt(dff['receita_anual'] / dff['receita_anual'].max())).astype('float32')
     )
-    
-    fig_scatter.update_layout(
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        legend=dict(orientation="h", yanchor="bottom", y=-0.25, xanchor="center", x=0.5)
+    fig_scatter = figura_sem_validacao(
+        [
+            dict(
+                type='scattergl',  # Um ponto por empresa: renderizar via WebGL
+                mode='markers',
+                x=grupo['numero_funcionarios'].to_numpy(),
+                y=grupo['receita_anual'].to_numpy(),
+                hovertext=grupo['nome_empresa'].tolist(),
+                name=setor,
+                legendgroup=setor,
+                marker=dict(
+                    color=mapa_cores_setores.get(setor, '#636EFA'),
+                    size=grupo['tamanho_ponto'].to_numpy(),
+                    symbol='circle'
+                ),
+                hovertemplate=f'<b>%{{hovertext}}</b><br><br>Setor={setor}<br>Número de Funcionários=%{{x}}<br>Receita Anual (R$)=%{{y}}<extra></extra>'
+            )
+            for setor, grupo in dados_scatter.groupby('setor', observed=True, sort=False)
+        ],
+        dict(
+            xaxis=eixo_com_grade(title=dict(text="Número de Funcionários")),
+            yaxis=eixo_com_grade(title=dict(text="Receita Anual (R$)"), type='log'),  # Escala logarítmica para melhor visualização
+            legend=legenda_horizontal(-0.25, title=dict(text="Setor"), tracegroupgap=0, itemsizing='constant'),
+            margin=margem_padrao
+        )
     )
     
     # Resumo da seleção
@@ -782,7 +1105,7 @@ def update_graficos(n_clicks, setores_selecionados, faixa_receita, faixa_funcion
         ]),
         html.P([
             html.Strong("Setores: "), 
-            f"{len(dff['setor'].unique())} diferentes"
+            f"{len(agregados_setor)} diferentes"
         ]),
         html.P([
             html.Strong("Período: "), 
@@ -790,46 +1113,56 @@ def update_graficos(n_clicks, setores_selecionados, faixa_receita, faixa_funcion
         ]),
     ])
     
-    # Criar tabela de dados com design melhorado
-    table_df = dff.copy()
-    table_df['receita_anual_formatada'] = table_df['receita_anual'].apply(lambda x: f"R$ {x:,.2f}")
-    
-    # Selecionar colunas para mostrar
-    table_df = table_df[['nome_empresa', 'setor', 'receita_anual_formatada', 'numero_funcionarios', 'pais', 'ano_fundacao', 'porte']]
-    table_df.columns = ['Nome da Empresa', 'Setor', 'Receita Anual', 'Nº Funcionários', 'País', 'Ano Fundação', 'Porte']
-    
-    tabela = dash_table.DataTable(
-        id='tabela',
-        columns=[{"name": i, "id": i} for i in table_df.columns],
-        data=table_df.to_dict('records'),
-        style_table={'overflowX': 'auto'},
-        style_header={
-            'backgroundColor': '#2C3E50',
-            'color': 'white',
-            'fontWeight': 'bold',
-            'border': '1px solid #222'
-        },
-        style_cell={
-            'backgroundColor': '#1E293B',
-            'color': 'white',
-            'border': '1px solid #222',
-            'padding': '8px',
-            'textAlign': 'left'
-        },
-        style_data_conditional=[
-            {
-                'if': {'row_index': 'odd'},
-                'backgroundColor': '#172331'
-            }
-        ],
-        page_size=10,
-        filter_action="native",
-        sort_action="native",
-        sort_mode="multi",
-        page_action="native"
+    figuras = [fig_pizza, fig_barras_receita, fig_barras_funcionarios, fig_linha_tempo, fig_top_empresas, fig_scatter]
+    return (*[pio.to_json(figura, validate=False) for figura in figuras], resumo)
+
+# Callback para paginar, ordenar e filtrar a tabela de dados no servidor
+@app.callback(
+    [Output('tabela', 'data'),
+     Output('tabela', 'page_count'),
+     Output('tabela', 'page_current')],
+    [Input('filtros-aplicados', 'data'),
+     Input('tabela', 'page_current'),
+     Input('tabela', 'page_size'),
+     Input('tabela', 'sort_by'),
+     Input('tabela', 'filter_query')]
+)
+def update_tabela(filtros_aplicados, page_current, page_size, sort_by, filter_query):
+    # Os filtros do painel só valem depois de aplicados, como nos gráficos e no resumo
+    if filtros_aplicados is None:
+        raise PreventUpdate
+    
+    dff, _ = filtrar_dados(
+        filtros_aplicados['setores'],
+        filtros_aplicados['receita'],
+        filtros_aplicados['funcionarios'],
+        filtros_aplicados['ano'],
+        filtros_aplicados['porte']
     )
     
-    return fig_pizza, fig_barras_receita, fig_barras_funcionarios, fig_linha_tempo, fig_top_empresas, fig_scatter, resumo, tabela
+    if filter_query:
+        dff = aplicar_filtro_tabela(dff, filter_query)
+    
+    if sort_by:
+        dff = dff.sort_values(
+            [coluna['column_id'] for coluna in sort_by],
+            ascending=[coluna['direction'] == 'asc' for coluna in sort_by],
+            kind='mergesort'
+        )
+    
+    # Voltar para a primeira página sempre que filtros ou ordenação mudarem
+    disparadores = [item['prop_id'] for item in callback_context.triggered]
+    total_paginas = max(1, -(-len(dff) // page_size))
+    if 'tabela.page_current' not in disparadores:
+        page_current = 0
+    page_current = min(page_current or 0, total_paginas - 1)
+    
+    # Apenas a página atual é formatada e enviada ao navegador
+    inicio = page_current * page_size
+    pagina = dff.iloc[inicio:inicio + page_size][list(colunas_tabela)]
+    pagina = pagina.assign(receita_anual='R$ ' + pagina['receita_anual'].map('{:,.2f}'.format).astype(str))
+    
+    return pagina.to_dict('records'), total_paginas, page_current
 
 # Callback para limpar filtros
 @app.callback(
@@ -843,7 +1176,65 @@ def update_graficos(n_clicks, setores_selecionados, faixa_receita, faixa_funcion
 def limpar_filtros(n_clicks):
     if n_clicks is None:
         raise PreventUpdate
-    return [], [0, receita_max], [0, funcionarios_max], [ano_min, ano_max], df['porte'].unique().tolist()
+    return [], [0, receita_max], [0, funcionarios_max], [ano_min, ano_max], portes_todos
+
+# Agregações das abas de análise: o dataframe não muda durante a execução do app,
+# então cada agrupamento é calculado uma única vez (e herdado pelos processos em segundo plano)
+dados_pais = df.groupby('pais', observed=True).agg(
+    quantidade_empresas=('nome_empresa', 'count'),
+    receita_total=('receita_anual', 'sum'),
+    funcionarios_total=('numero_funcionarios', 'sum')
+).reset_index()
+# O código ISO é função do nome do país: consultar o mapa já calculado em vez de agregá-lo
+dados_pais['codigo_pais'] = dados_pais['pais'].map(mapa_codigos_pais)
+
+# Distribuição por porte
+codigos_categoria_porte = df['porte'].cat.codes.to_numpy()
+contagem_porte = pd.DataFrame({
+    'porte': df['porte'].cat.categories,
+    'contagem': np.bincount(codigos_categoria_porte[codigos_categoria_porte >= 0], minlength=len(df['porte'].cat.categories))
+})
+
+cores_porte = {
+    'Micro': '#3498db',
+    'Pequena': '#2ecc71',
+    'Média': '#f39c12',
+    'Grande': '#e74c3c',
+    'Corporação': '#9b59b6'
+}
+
+# Receita média por porte, garantindo a ordenação correta
+ordem_porte = ['Micro', 'Pequena', 'Média', 'Grande', 'Corporação']
+receita_por_porte = df.groupby('porte')['receita_anual'].mean().reset_index()
+receita_por_porte['porte'] = pd.Categorical(
+    receita_por_porte['porte'], 
+    categories=ordem_porte, 
+    ordered=True
+)
+receita_por_porte = receita_por_porte.sort_values('porte')
+
+# Evolução por porte ao longo do tempo
+evolucao_porte = df.groupby(['ano_fundacao', 'porte']).size().reset_index(name='contagem')
+evolucao_porte['porte'] = pd.Categorical(
+    evolucao_porte['porte'], 
+    categories=ordem_porte, 
+    ordered=True
+)
+
+# Mapa de correlação entre as métricas numéricas, já com os nomes de exibição
+colunas_numericas = ['receita_anual', 'numero_funcionarios', 'ano_fundacao', 'idade_empresa', 'receita_por_funcionario']
+matriz_corr = df[colunas_numericas].corr()
+
+nomes_colunas = {
+    'receita_anual': 'Receita Anual',
+    'numero_funcionarios': 'Nº Funcionários',
+    'ano_fundacao': 'Ano Fundação',
+    'idade_empresa': 'Idade Empresa',
+    'receita_por_funcionario': 'Receita/Funcionário'
+}
+
+matriz_corr.index = [nomes_colunas[col] for col in matriz_corr.index]
+matriz_corr.columns = [nomes_colunas[col] for col in matriz_corr.columns]
 
 # Callbacks para visualizações de distribuição geográfica
 @app.callback(
@@ -856,20 +1247,17 @@ def update_visualizacoes_geograficas(tab):
     if tab != "distribuicao-geografica":
         raise PreventUpdate
     
-    # Mapa mundial de empresas
-    dff = df.copy()
-    
-    # Agrupar dados por país
-    dados_pais = dff.groupby('pais').agg({
-        'nome_empresa': 'count',
-        'receita_anual': 'sum',
-        'numero_funcionarios': 'sum',
-        'codigo_pais': 'first'
-    }).reset_index()
-    
-    dados_pais.columns = ['pais', 'quantidade_empresas', 'receita_total', 'funcionarios_total', 'codigo_pais']
+    return [json.loads(figura) for figura in calcular_visualizacoes_geograficas()]
+
+@cache.memoize(timeout=3600)
+def calcular_visualizacoes_geograficas():
+    """
+    Constrói as figuras da aba de distribuição geográfica
     
-    # Criar mapa
+    Returns:
+        tuple: Mapa e gráficos de países serializados em JSON
+    """
+    # Mapa mundial de empresas
     fig_mapa = px.choropleth(
         dados_pais,
         locations="codigo_pais",
@@ -916,9 +1304,9 @@ def update_visualizacoes_geograficas(tab):
     fig_paises_receita.update_layout(
         xaxis_title="País",
         yaxis_title="Receita Total (R$)",
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
+        margin=margem_padrao,
+        xaxis=eixo_com_grade(),
+        yaxis=eixo_com_grade()
     )
     
     # Top 10 países por quantidade de empresas
@@ -940,12 +1328,12 @@ def update_visualizacoes_geograficas(tab):
     fig_paises_quantidade.update_layout(
         xaxis_title="País",
         yaxis_title="Número de Empresas",
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
+        margin=margem_padrao,
+        xaxis=eixo_com_grade(),
+        yaxis=eixo_com_grade()
     )
     
-    return fig_mapa, fig_paises_receita, fig_paises_quantidade
+    return tuple(pio.to_json(figura, validate=False) for figura in (fig_mapa, fig_paises_receita, fig_paises_quantidade))
 
 # Callbacks para visualizações de análise por porte
 @app.callback(
@@ -958,20 +1346,16 @@ def update_visualizacoes_porte(tab):
     if tab != "analise-porte":
         raise PreventUpdate
     
-    dff = df.copy()
-    
-    # Distribuição por porte
-    contagem_porte = dff['porte'].value_counts().reset_index()
-    contagem_porte.columns = ['porte', 'contagem']
-    
-    cores_porte = {
-        'Micro': '#3498db',
-        'Pequena': '#2ecc71',
-        'Média': '#f39c12',
-        'Grande': '#e74c3c',
-        'Corporação': '#9b59b6'
-    }
+    return [json.loads(figura) for figura in calcular_visualizacoes_porte()]
+
+@cache.memoize(timeout=3600)
+def calcular_visualizacoes_porte():
+    """
+    Constrói as figuras da aba de análise por porte
     
+    Returns:
+        tuple: Gráficos de distribuição, receita e evolução por porte serializados em JSON
+    """
     fig_porte_pie = px.pie(
         contagem_porte, 
         names='porte', 
@@ -990,22 +1374,10 @@ def update_visualizacoes_porte(tab):
     
     fig_porte_pie.update_layout(
         legend_title_text='Porte',
-        margin=dict(t=30, b=0, l=10, r=10),
-        legend=dict(orientation="h", yanchor="bottom", y=-0.15, xanchor="center", x=0.5)
+        margin=margem_padrao,
+        legend=legenda_horizontal(-0.15)
     )
     
-    # Receita média por porte
-    receita_por_porte = dff.groupby('porte')['receita_anual'].mean().reset_index()
-    
-    # Garantir ordenação correta
-    ordem_porte = ['Micro', 'Pequena', 'Média', 'Grande', 'Corporação']
-    receita_por_porte['porte'] = pd.Categorical(
-        receita_por_porte['porte'], 
-        categories=ordem_porte, 
-        ordered=True
-    )
-    receita_por_porte = receita_por_porte.sort_values('porte')
-    
     fig_porte_receita = px.bar(
         receita_por_porte,
         x='porte',
@@ -1023,17 +1395,9 @@ def update_visualizacoes_porte(tab):
         xaxis_title="Porte",
         yaxis_title="Receita Média (R$)",
         showlegend=False,
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
-    )
-    
-    # Evolução por porte ao longo do tempo
-    evolucao_porte = dff.groupby(['ano_fundacao', 'porte']).size().reset_index(name='contagem')
-    evolucao_porte['porte'] = pd.Categorical(
-        evolucao_porte['porte'], 
-        categories=ordem_porte, 
-        ordered=True
+        margin=margem_padrao,
+        xaxis=eixo_com_grade(),
+        yaxis=eixo_com_grade()
     )
     
     fig_porte_tempo = px.area(
@@ -1053,121 +1417,121 @@ def update_visualizacoes_porte(tab):
     fig_porte_tempo.update_layout(
         xaxis_title="Ano de Fundação",
         yaxis_title="Número de Empresas",
-        margin=dict(t=30, b=0, l=10, r=10),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+        margin=margem_padrao,
+        xaxis=eixo_com_grade(),
+        yaxis=eixo_com_grade(),
+        legend=legenda_horizontal(-0.2)
     )
     
-    return fig_porte_pie, fig_porte_receita, fig_porte_tempo
+    return tuple(pio.to_json(figura, validate=False) for figura in (fig_porte_pie, fig_porte_receita, fig_porte_tempo))
 
-# Callback para gerar insights automáticos
+def criar_alerta(icone, titulo, texto, cor):
+    """
+    Monta um alerta de insight já no formato serializado dos componentes Dash
+    
+    A estrutura dos alertas é fixa: montar o dicionário diretamente evita instanciar
+    dbc.Alert, html.I e html.Strong a cada execução do callback.
+    
+    Returns:
+        dict: Componente dbc.Alert com ícone, título em negrito e texto
+    """
+    return {
+        'type': 'Alert',
+        'namespace': 'dash_bootstrap_components',
+        'props': {
+            'children': [
+                {'type': 'I', 'namespace': 'dash_html_components', 'props': {'children': None, 'className': icone}},
+                {'type': 'Strong', 'namespace': 'dash_html_components', 'props': {'children': titulo}},
+                texto
+            ],
+            'className': 'mb-3',
+            'color': cor
+        }
+    }
+
+# Callback leve que só dispara os insights quando a aba deles é aberta, evitando
+# iniciar um job em segundo plano a cada troca de aba
 @app.callback(
-    [Output('insights-automaticos', 'children'),
-     Output('grafico-correlacao', 'figure')],
-    [Input('tabs-principal', 'active_tab')]
+    Output('gatilho-insights', 'data'),
+    [Input('tabs-principal', 'active_tab')],
+    [State('gatilho-insights', 'data')]
 )
-def gerar_insights(tab):
+def disparar_insights(tab, aberturas):
     if tab != "insights":
         raise PreventUpdate
     
-    dff = df.copy()
+    # Um contador garante que o valor mude a cada abertura da aba
+    return (aberturas or 0) + 1
+
+# Callback para gerar insights automáticos
+@app.callback(
+    [Output('insights-automaticos', 'children'),
+     Output('grafico-correlacao', 'figure')],
+    [Input('gatilho-insights', 'data')],
+    background=True,
+    prevent_initial_call=True
+)
+def gerar_insights(aberturas):
+    # Os dados são somente leitura aqui: usar o dataframe base sem copiá-lo
+    dff = df
     
     # Lista para armazenar insights
     insights_list = []
     
     # 1. Setor com maior receita média
-    setor_maior_receita = dff.groupby('setor')['receita_anual'].mean().idxmax()
-    valor_maior_receita = dff.groupby('setor')['receita_anual'].mean().max()
-    insights_list.append(
-        dbc.Alert(
-            [
-                html.I(className="fas fa-chart-line mr-2"),
-                html.Strong("Setor mais lucrativo: "),
-                f"O setor de {setor_maior_receita} apresenta a maior receita média (R$ {valor_maior_receita/1e6:.2f} milhões)."
-            ],
-            color="success",
-            className="mb-3"
-        )
-    )
+    receita_media_setor = dff.groupby('setor', observed=True)['receita_anual'].mean()
+    setor_maior_receita = receita_media_setor.idxmax()
+    valor_maior_receita = receita_media_setor.loc[setor_maior_receita]
+    insights_list.append(criar_alerta(
+        "fas fa-chart-line mr-2",
+        "Setor mais lucrativo: ",
+        f"O setor de {setor_maior_receita} apresenta a maior receita média (R$ {valor_maior_receita/1e6:.2f} milhões).",
+        "success"
+    ))
     
     # 2. Setor com mais empresas
-    setor_mais_empresas = dff['setor'].value_counts().idxmax()
-    qtd_empresas = dff['setor'].value_counts().max()
-    insights_list.append(
-        dbc.Alert(
-            [
-                html.I(className="fas fa-building mr-2"),
-                html.Strong("Setor predominante: "),
-                f"O setor de {setor_mais_empresas} possui o maior número de empresas ({qtd_empresas}), representando {qtd_empresas/len(dff)*100:.1f}% do total."
-            ],
-            color="info",
-            className="mb-3"
-        )
-    )
-    
-    # 3. Eficiência (receita por funcionário)
-    dff['receita_por_funcionario'] = dff['receita_anual'] / dff['numero_funcionarios']
-    setor_mais_eficiente = dff.groupby('setor')['receita_por_funcionario'].mean().idxmax()
-    valor_eficiencia = dff.groupby('setor')['receita_por_funcionario'].mean().max()
-    insights_list.append(
-        dbc.Alert(
-            [
-                html.I(className="fas fa-bolt mr-2"),
-                html.Strong("Setor mais eficiente: "),
-                f"O setor de {setor_mais_eficiente} apresenta a maior receita por funcionário (R$ {valor_eficiencia/1e3:.2f} mil por funcionário)."
-            ],
-            color="warning",
-            className="mb-3"
-        )
-    )
+    # value_counts já vem ordenado de forma decrescente: o primeiro item é o máximo
+    contagem_setores = dff['setor'].value_counts()
+    setor_mais_empresas = contagem_setores.index[0]
+    qtd_empresas = contagem_setores.iloc[0]
+    insights_list.append(criar_alerta(
+        "fas fa-building mr-2",
+        "Setor predominante: ",
+        f"O setor de {setor_mais_empresas} possui o maior número de empresas ({qtd_empresas}), representando {qtd_empresas/len(dff)*100:.1f}% do total.",
+        "info"
+    ))
+    
+    # 3. Eficiência (receita por funcionário, já calculada em normalizar_colunas)
+    eficiencia_setor = dff.groupby('setor', observed=True)['receita_por_funcionario'].mean()
+    setor_mais_eficiente = eficiencia_setor.idxmax()
+    valor_eficiencia = eficiencia_setor.loc[setor_mais_eficiente]
+    insights_list.append(criar_alerta(
+        "fas fa-bolt mr-2",
+        "Setor mais eficiente: ",
+        f"O setor de {setor_mais_eficiente} apresenta a maior receita por funcionário (R$ {valor_eficiencia/1e3:.2f} mil por funcionário).",
+        "warning"
+    ))
     
     # 4. Tendência de crescimento
-    anos = sorted(dff['ano_fundacao'].unique())
-    setores_recentes = dff[dff['ano_fundacao'] >= anos[-5]]['setor'].value_counts()
+    setores_recentes = dff[dff['ano_fundacao'] >= anos_ordenados[-5]]['setor'].value_counts()
     setor_crescimento = setores_recentes.idxmax()
-    insights_list.append(
-        dbc.Alert(
-            [
-                html.I(className="fas fa-arrow-trend-up mr-2"),
-                html.Strong("Tendência de crescimento: "),
-                f"O setor de {setor_crescimento} lidera em número de novas empresas nos últimos 5 anos, indicando uma tendência de expansão."
-            ],
-            color="primary",
-            className="mb-3"
-        )
-    )
+    insights_list.append(criar_alerta(
+        "fas fa-arrow-trend-up mr-2",
+        "Tendência de crescimento: ",
+        f"O setor de {setor_crescimento} lidera em número de novas empresas nos últimos 5 anos, indicando uma tendência de expansão.",
+        "primary"
+    ))
     
     # 5. Distribuição geográfica
-    pais_dominante = dff['pais'].value_counts().idxmax()
-    qtd_pais = dff['pais'].value_counts().max()
-    insights_list.append(
-        dbc.Alert(
-            [
-                html.I(className="fas fa-globe mr-2"),
-                html.Strong("Concentração geográfica: "),
-                f"{pais_dominante} é o país com maior número de empresas ({qtd_pais}), representando {qtd_pais/len(dff)*100:.1f}% do total."
-            ],
-            color="secondary",
-            className="mb-3"
-        )
-    )
-    
-    # Mapa de correlação
-    colunas_numericas = ['receita_anual', 'numero_funcionarios', 'ano_fundacao', 'idade_empresa', 'receita_por_funcionario']
-    matriz_corr = dff[colunas_numericas].corr()
-    
-    # Renomear para melhor visualização
-    nomes_colunas = {
-        'receita_anual': 'Receita Anual',
-        'numero_funcionarios': 'Nº Funcionários',
-        'ano_fundacao': 'Ano Fundação',
-        'idade_empresa': 'Idade Empresa',
-        'receita_por_funcionario': 'Receita/Funcionário'
-    }
-    
-    matriz_corr.index = [nomes_colunas[col] for col in matriz_corr.index]
-    matriz_corr.columns = [nomes_colunas[col] for col in matriz_corr.columns]
+    contagem_paises = dff['pais'].value_counts()
+    pais_dominante = contagem_paises.index[0]
+    qtd_pais = contagem_paises.iloc[0]
+    insights_list.append(criar_alerta(
+        "fas fa-globe mr-2",
+        "Concentração geográfica: ",
+        f"{pais_dominante} é o país com maior número de empresas ({qtd_pais}), representando {qtd_pais/len(dff)*100:.1f}% do total.",
+        "secondary"
+    ))
     
     # Criar mapa de calor
     fig_correlacao = px.imshow(
@@ -3,10 +3,23 @@ Módulo para análise e visualização de dados das empresas
 """
 
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+import matplotlib
+matplotlib.use('Agg')  # Gráficos apenas salvos em arquivo: sem backend interativo
 import matplotlib.pyplot as plt
 import os
 from datetime import datetime
 
+# XlsxWriter é opcional: grava planilhas bem mais rápido que o openpyxl
+try:
+    import xlsxwriter  # noqa: F401
+    MOTOR_EXCEL = 'xlsxwriter'
+except ImportError:
+    MOTOR_EXCEL = 'openpyxl'
+
+# Tabela de tradução para converter "1,234.56" em "1.234,56"
+_TABELA_MOEDA_BR = str.maketrans({',': '.', '.': ','})
+
 class AnalisadorDados:
     """Classe para análise e visualização de dados das empresas"""
     
@@ -18,13 +31,51 @@ class AnalisadorDados:
             dados_empresas (list): Lista de dicionários com dados das empresas
         """
         self.df = pd.DataFrame(dados_empresas)
+        
+        # Inteiros no menor tipo possível (a receita continua em float64 para preservar os centavos)
+        if 'numero_funcionarios' in self.df.columns:
+            self.df['numero_funcionarios'] = pd.to_numeric(self.df['numero_funcionarios'], downcast='unsigned')
         self.diretorio_saida = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
         os.makedirs(self.diretorio_saida, exist_ok=True)
+        
+        # Uma única figura é reaproveitada por todos os gráficos (criada sob demanda)
+        self._fig = None
+    
+    def _preparar_eixos(self, largura, altura):
+        """
+        Limpa e redimensiona a figura compartilhada para um novo gráfico
+        
+        Args:
+            largura (float): Largura da figura em polegadas
+            altura (float): Altura da figura em polegadas
+            
+        Returns:
+            matplotlib.axes.Axes: Eixos prontos para desenhar
+        """
+        if self._fig is None:
+            self._fig = plt.figure()
+            parametros = self._fig.subplotpars
+            self._margens_padrao = {nome: getattr(parametros, nome) for nome in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')}
+        
+        # Apenas os eixos são recriados; a figura e o canvas do backend são mantidos
+        self._fig.clear()
+        # Desfazer as margens ajustadas pelo tight_layout do gráfico anterior
+        self._fig.subplots_adjust(**self._margens_padrao)
+        self._fig.set_size_inches(largura, altura)
+        return self._fig.add_subplot()
+    
+    def fechar(self):
+        """Libera a figura compartilhada do matplotlib"""
+        if self._fig is not None:
+            plt.close(self._fig)
+            self._fig = None
     
     def converter_data_fundacao(self):
         """Converte a coluna de data_fundacao para o tipo datetime"""
-        self.df['data_fundacao'] = pd.to_datetime(self.df['data_fundacao'])
-        self.df['ano_fundacao'] = self.df['data_fundacao'].dt.year
+        # Documentos gravados pelo data_generator já trazem datetime: só converter textos
+        if not is_datetime64_any_dtype(self.df['data_fundacao']):
+            self.df['data_fundacao'] = pd.to_datetime(self.df['data_fundacao'])
+        self.df['ano_fundacao'] = pd.to_numeric(self.df['data_fundacao'].dt.year, downcast='integer')
     
     def visualizar_distribuicao_setores(self):
         """
@@ -35,15 +86,14 @@ class AnalisadorDados:
         """
         count_by_sector = self.df['setor'].value_counts()
         
-        plt.figure(figsize=(10, 6))
-        plt.pie(count_by_sector, labels=count_by_sector.index, autopct='%1.1f%%', shadow=True)
-        plt.title('Distribuição de Empresas por Setor')
-        plt.axis('equal')
+        ax = self._preparar_eixos(10, 6)
+        ax.pie(count_by_sector, labels=count_by_sector.index, autopct='%1.1f%%', shadow=True)
+        ax.set_title('Distribuição de Empresas por Setor')
+        ax.axis('equal')
         
         # Salvar o gráfico
         caminho_arquivo = os.path.join(self.diretorio_saida, 'distribuicao_setores.png')
-        plt.savefig(caminho_arquivo)
-        plt.close()
+        self._fig.savefig(caminho_arquivo)
         
         return caminho_arquivo
     
@@ -56,25 +106,24 @@ class AnalisadorDados:
         """
         receita_por_setor = self.df.groupby('setor')['receita_anual'].mean().sort_values(ascending=False)
         
-        plt.figure(figsize=(12, 6))
-        bars = plt.bar(receita_por_setor.index, receita_por_setor.values / 1e6)
+        ax = self._preparar_eixos(12, 6)
+        bars = ax.bar(receita_por_setor.index, receita_por_setor.values / 1e6)
         
         # Adicionar rótulos nas barras
         for bar in bars:
             height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 0.3,
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.3,
                     f'${height:.1f}M', ha='center', va='bottom')
         
-        plt.title('Receita Média Anual por Setor (em milhões)')
-        plt.ylabel('Receita Média (milhões $)')
-        plt.xlabel('Setor')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title('Receita Média Anual por Setor (em milhões)')
+        ax.set_ylabel('Receita Média (milhões $)')
+        ax.set_xlabel('Setor')
+        ax.tick_params(axis='x', labelrotation=45)
+        self._fig.tight_layout()
         
         # Salvar o gráfico
         caminho_arquivo = os.path.join(self.diretorio_saida, 'receita_por_setor.png')
-        plt.savefig(caminho_arquivo)
-        plt.close()
+        self._fig.savefig(caminho_arquivo)
         
         return caminho_arquivo
     
@@ -87,37 +136,40 @@ class AnalisadorDados:
         """
         funcionarios_por_setor = self.df.groupby('setor')['numero_funcionarios'].mean().sort_values(ascending=False)
         
-        plt.figure(figsize=(12, 6))
-        bars = plt.bar(funcionarios_por_setor.index, funcionarios_por_setor.values, color='green')
+        ax = self._preparar_eixos(12, 6)
+        bars = ax.bar(funcionarios_por_setor.index, funcionarios_por_setor.values, color='green')
         
         # Adicionar rótulos nas barras
         for bar in bars:
             height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 1,
+            ax.text(bar.get_x() + bar.get_width()/2., height + 1,
                     f'{int(height)}', ha='center', va='bottom')
         
-        plt.title('Número Médio de Funcionários por Setor')
-        plt.ylabel('Média de Funcionários')
-        plt.xlabel('Setor')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title('Número Médio de Funcionários por Setor')
+        ax.set_ylabel('Média de Funcionários')
+        ax.set_xlabel('Setor')
+        ax.tick_params(axis='x', labelrotation=45)
+        self._fig.tight_layout()
         
         # Salvar o gráfico
         caminho_arquivo = os.path.join(self.diretorio_saida, 'funcionarios_por_setor.png')
-        plt.savefig(caminho_arquivo)
-        plt.close()
+        self._fig.savefig(caminho_arquivo)
         
         return caminho_arquivo
     
-    def exportar_dados_csv(self):
+    def exportar_dados_csv(self, exportar_excel=True):
         """
         Exporta os dados para um arquivo CSV
         
+        Args:
+            exportar_excel (bool): Se True, grava também uma cópia em Excel
+        
         Returns:
             str: Caminho do arquivo salvo
         """
-        # Formatar os valores monetários
-        self.df['receita_anual_formatada'] = self.df['receita_anual'].apply(lambda x: f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'))
+        # Formatar os valores monetários no padrão brasileiro: o str.translate troca
+        # vírgulas e pontos em uma única passada, sem uma lambda por linha
+        self.df['receita_anual_formatada'] = 'R$ ' + self.df['receita_anual'].map('{:,.2f}'.format).astype(str).str.translate(_TABELA_MOEDA_BR)
         
         # Reordenar as colunas para melhor visualização
         colunas_ordenadas = ['nome_empresa', 'setor', 'receita_anual_formatada', 'numero_funcionarios', 
@@ -154,10 +206,13 @@ class AnalisadorDados:
         caminho_arquivo = os.path.join(self.diretorio_saida, 'dados_empresas.csv')
         df_export.to_csv(caminho_arquivo, index=False, encoding='utf-8-sig', sep=';')
         
+        if not exportar_excel:
+            return caminho_arquivo
+        
         # Exportar também como Excel se pandas tiver a funcionalidade
         try:
             caminho_excel = os.path.join(self.diretorio_saida, 'dados_empresas.xlsx')
-            df_export.to_excel(caminho_excel, index=False, engine='openpyxl')
+            df_export.to_excel(caminho_excel, index=False, engine=MOTOR_EXCEL)
             return caminho_excel  # Priorizar retornar o caminho do Excel
         except:
             return caminho_arquivo  # Retornar apenas o CSV se Excel falhar
@@ -177,5 +232,6 @@ class AnalisadorDados:
             'funcionarios_por_setor': self.visualizar_funcionarios_por_setor(),
             'dados_csv': self.exportar_dados_csv()
         }
+        self.fechar()
         
         return relatorio
\ No newline at end of file
@@ -3,7 +3,10 @@ Módulo para gerar dados fictícios usando a biblioteca Faker
 """
 
 from faker import Faker
-import random
+import numpy as np
+from datetime import date
+
+SETORES = ['Tecnologia', 'Saúde', 'Finanças', 'Educação', 'RH']
 
 def gerar_empresas(quantidade=20):
     """
@@ -16,17 +19,33 @@ def gerar_empresas(quantidade=20):
         list: Lista de dicionários com dados de empresas
     """
     faker = Faker()
-    empresas = []
-
-    for _ in range(quantidade):
-        empresa = {
-            "nome_empresa": faker.company(),
-            "setor": random.choice(['Tecnologia', 'Saúde', 'Finanças', 'Educação', 'RH']),
-            "receita_anual": round(random.uniform(1000000, 1000000000), 2),
-            "numero_funcionarios": random.randint(10, 500),
-            "pais": faker.country(),
-            "data_fundacao": faker.date_between(start_date='-50y', end_date='today').strftime('%Y-%m-%d')
-        }
-        empresas.append(empresa)
+    rng = np.random.default_rng()
     
-    return empresas
\ No newline at end of file
+    # Apenas nomes e países dependem do Faker; as colunas numéricas são geradas de uma vez com NumPy
+    nomes = [faker.company() for _ in range(quantidade)]
+    paises = [faker.country() for _ in range(quantidade)]
+    setores = rng.choice(SETORES, quantidade)
+    receitas = rng.uniform(1000000, 1000000000, quantidade).round(2)
+    funcionarios = rng.integers(10, 500, quantidade, endpoint=True)
+    
+    # Datas de fundação entre 50 anos atrás e hoje (mesmo intervalo que '-50y' no Faker)
+    hoje = np.datetime64(date.today(), 'D')
+    dias = rng.integers(0, round(50 * 365.25), quantidade, endpoint=True)
+    datas = hoje - dias.astype('timedelta64[D]')
+    
+    # tolist() converte para tipos nativos do Python, aceitos pelo pymongo; as datas viram
+    # datetime (meia-noite), gravado como BSON Date em vez de texto
+    return [
+        {
+            "nome_empresa": nome,
+            "setor": setor,
+            "receita_anual": receita,
+            "numero_funcionarios": numero_funcionarios,
+            "pais": pais,
+            "data_fundacao": data_fundacao
+        }
+        for nome, setor, receita, numero_funcionarios, pais, data_fundacao in zip(
+            nomes, setores.tolist(), receitas.tolist(), funcionarios.tolist(), paises,
+            datas.astype('datetime64[ms]').tolist()
+        )
+    ]
@@ -0,0 +1,70 @@
+"""
+Módulo para interpretar e aplicar a sintaxe de filtro do DataTable do Dash
+"""
+
+import re
+
+# Operadores da sintaxe de filtro do DataTable (formas por extenso, simbólicas e com prefixo "s")
+OPERADORES_FILTRO = {
+    'eq': 'eq', '=': 'eq', 's=': 'eq',
+    'ne': 'ne', '!=': 'ne', 's!=': 'ne',
+    'lt': 'lt', '<': 'lt', 's<': 'lt',
+    'le': 'le', '<=': 'le', 's<=': 'le',
+    'gt': 'gt', '>': 'gt', 's>': 'gt',
+    'ge': 'ge', '>=': 'ge', 's>=': 'ge',
+    'contains': 'contains', 'scontains': 'contains',
+    'datestartswith': 'datestartswith', 'sdatestartswith': 'datestartswith'
+}
+
+# O operador é sempre o token logo após o nome da coluna entre chaves; o restante é o valor
+_PADRAO_FILTRO = re.compile(r'\s*\{(.+?)\}\s*(s?[!<>=]+|[a-z]+)\s*(.*?)\s*$', re.DOTALL)
+
+def dividir_filtro(parte_filtro):
+    """
+    Separa uma expressão de filtro do DataTable em coluna, operador e valor
+    
+    Args:
+        parte_filtro (str): Expressão como '{receita_anual} >= 1000' ou '{nome_empresa} contains "Page LLC"'
+    
+    Returns:
+        tuple: Nome da coluna, operador normalizado e valor (float quando numérico),
+            ou (None, None, None) se a expressão não for reconhecida
+    """
+    correspondencia = _PADRAO_FILTRO.match(parte_filtro)
+    if not correspondencia:
+        return None, None, None
+    
+    nome, simbolo, parte_valor = correspondencia.groups()
+    operador = OPERADORES_FILTRO.get(simbolo)
+    if operador is None:
+        return None, None, None
+    
+    delimitador = parte_valor[:1]
+    if len(parte_valor) > 1 and delimitador == parte_valor[-1] and delimitador in ("'", '"', '`'):
+        valor = parte_valor[1:-1].replace('\\' + delimitador, delimitador)
+    else:
+        try:
+            valor = float(parte_valor)
+        except ValueError:
+            valor = parte_valor
+    return nome, operador, valor
+
+def aplicar_filtro_tabela(dff, filter_query):
+    """Aplica ao dataframe a expressão de filtro digitada no DataTable"""
+    for parte_filtro in filter_query.split(' && '):
+        coluna, operador, valor = dividir_filtro(parte_filtro)
+        if coluna not in dff.columns:
+            continue
+        try:
+            if operador in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+                dff = dff.loc[getattr(dff[coluna], operador)(valor)]
+            else:
+                texto = valor if isinstance(valor, str) else f'{valor:g}'
+                if operador == 'contains':
+                    dff = dff.loc[dff[coluna].astype(str).str.contains(texto, regex=False)]
+                elif operador == 'datestartswith':
+                    dff = dff.loc[dff[coluna].astype(str).str.startswith(texto)]
+        except TypeError:
+            # Comparação incompatível com o tipo da coluna: ignorar esta parte do filtro
+            continue
+    return dff
@@ -6,6 +6,7 @@ import os
 import sys
 import logging
 from datetime import datetime
+from pymongo.errors import OperationFailure
 
 # Adicionar o diretório pai ao sys.path para permitir importações relativas
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -42,18 +43,24 @@ def main():
         logger.info("Conectando ao MongoDB")
         mongo_manager = MongoDBManager()
         
-        # Verificar se já existem dados na coleção
-        dados_existentes = mongo_manager.buscar_todos()
+        # Verificar se já existem dados na coleção (sem carregá-la)
+        quantidade_existente = mongo_manager.contar_documentos()
         
-        if not dados_existentes:
+        if not quantidade_existente:
             # Inserir dados se a coleção estiver vazia
             logger.info("Inserindo dados no MongoDB")
             num_inseridos = mongo_manager.inserir_muitos(empresas)
             logger.info(f"Inseridos {num_inseridos} documentos no MongoDB")
-            dados_empresas = mongo_manager.buscar_todos()
         else:
-            logger.info(f"Utilizando {len(dados_existentes)} documentos já existentes no MongoDB")
-            dados_empresas = dados_existentes
+            logger.info(f"Utilizando {quantidade_existente} documentos já existentes no MongoDB")
+        
+        # Garantir os índices usados nas consultas por setor (também em coleções já existentes)
+        try:
+            mongo_manager.criar_indices()
+        except OperationFailure as e:
+            logger.warning(f"Não foi possível criar os índices no MongoDB: {str(e)}")
+        
+        dados_empresas = mongo_manager.buscar_todos()
         
         # Analisar e visualizar dados
         logger.info("Iniciando análise e visualização de dados")
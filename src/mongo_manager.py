@@ -2,9 +2,33 @@
 Módulo para gerenciar operações com o MongoDB
 """
 
+import pandas as pd
 from pymongo import MongoClient
 from config.mongodb_config import MONGODB_URI, DATABASE_NAME, COLLECTION_NAME
 
+# PyMongoArrow é opcional: permite montar o DataFrame de forma colunar, sem a lista de dicionários
+try:
+    from pymongoarrow.api import find_pandas_all
+except ImportError:
+    find_pandas_all = None
+
+# Campos usados nas análises; eventuais campos extras não são trazidos do servidor.
+# O _id é mantido nas buscas em lista (exportado como coluna ID pelo AnalisadorDados)
+PROJECAO_EMPRESAS = {
+    'nome_empresa': 1,
+    'setor': 1,
+    'receita_anual': 1,
+    'numero_funcionarios': 1,
+    'pais': 1,
+    'data_fundacao': 1
+}
+
+# O dashboard não usa o _id: o DataFrame é montado sem ele
+PROJECAO_EMPRESAS_SEM_ID = {**PROJECAO_EMPRESAS, '_id': 0}
+
+# Quantidade de documentos enviada a cada insert_many
+TAMANHO_LOTE_INSERCAO = 10000
+
 class MongoDBManager:
     """Classe para gerenciar operações com o MongoDB"""
     
@@ -14,6 +38,15 @@ class MongoDBManager:
         self.db = self.client[DATABASE_NAME]
         self.collection = self.db[COLLECTION_NAME]
     
+    def criar_indices(self):
+        """
+        Cria o índice por setor (com a receita, para cobrir a agregação de médias)
+        
+        A operação é idempotente, mas exige permissão de escrita e uma ida ao servidor:
+        deve ser chamada apenas pelo processo que popula a coleção.
+        """
+        self.collection.create_index([('setor', 1), ('receita_anual', 1)])
+    
     def inserir_muitos(self, documentos):
         """
         Insere múltiplos documentos na coleção
@@ -24,8 +57,16 @@ class MongoDBManager:
         Returns:
             int: Número de documentos inseridos
         """
-        resultado = self.collection.insert_many(documentos)
-        return len(resultado.inserted_ids)
+        # Inserção em lotes e sem ordem garantida: o servidor não precisa confirmar
+        # um documento antes de gravar o próximo
+        num_inseridos = 0
+        for inicio in range(0, len(documentos), TAMANHO_LOTE_INSERCAO):
+            resultado = self.collection.insert_many(
+                documentos[inicio:inicio + TAMANHO_LOTE_INSERCAO],
+                ordered=False
+            )
+            num_inseridos += len(resultado.inserted_ids)
+        return num_inseridos
     
     def buscar_todos(self):
         """
@@ -34,7 +75,39 @@ class MongoDBManager:
         Returns:
             list: Lista com todos os documentos
         """
-        return list(self.collection.find())
+        return list(self.collection.find({}, PROJECAO_EMPRESAS))
+    
+    def contar_documentos(self):
+        """
+        Conta os documentos da coleção usando os metadados, sem percorrê-la
+        
+        Returns:
+            int: Número estimado de documentos na coleção
+        """
+        return self.collection.estimated_document_count()
+    
+    def buscar_todos_df(self):
+        """
+        Busca todos os documentos na coleção diretamente como DataFrame
+        
+        Usa o PyMongoArrow quando instalado; caso contrário, percorre o cursor em lotes
+        e acumula os valores por coluna, sem guardar um dicionário por documento.
+        
+        Returns:
+            pandas.DataFrame: DataFrame com os campos de PROJECAO_EMPRESAS_SEM_ID
+        """
+        if find_pandas_all is not None:
+            return find_pandas_all(self.collection, {}, projection=PROJECAO_EMPRESAS_SEM_ID)
+        
+        campos = [campo for campo, incluir in PROJECAO_EMPRESAS_SEM_ID.items() if incluir]
+        colunas = {campo: [] for campo in campos}
+        for documento in self.collection.find({}, PROJECAO_EMPRESAS_SEM_ID, batch_size=1000):
+            for campo in campos:
+                colunas[campo].append(documento.get(campo))
+        
+        if not colunas[campos[0]]:
+            return pd.DataFrame()
+        return pd.DataFrame(colunas)
     
     def buscar_por_setor(self, setor):
         """
@@ -46,7 +119,7 @@ class MongoDBManager:
         Returns:
             list: Lista com as empresas do setor especificado
         """
-        return list(self.collection.find({"setor": setor}))
+        return list(self.collection.find({"setor": setor}, PROJECAO_EMPRESAS))
     
     def calcular_media_receita_por_setor(self):
         """
@@ -55,7 +128,10 @@ class MongoDBManager:
         Returns:
             dict: Dicionário com setores como chaves e médias como valores
         """
+        # Ordenar e projetar apenas setor e receita permite ao MongoDB responder pelo índice
         pipeline = [
+            {"$sort": {"setor": 1}},
+            {"$project": {"setor": 1, "receita_anual": 1, "_id": 0}},
             {"$group": {
                 "_id": "$setor",
                 "media_receita": {"$avg": "$receita_anual"}
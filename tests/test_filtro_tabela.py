@@ -0,0 +1,43 @@
+"""
+Testes da interpretação da sintaxe de filtro do DataTable
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+# Adicionar o diretório raiz ao sys.path para importar o pacote src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.filtro_tabela import aplicar_filtro_tabela, dividir_filtro
+
+
+def test_valor_com_palavra_de_operador_nao_vira_comparacao():
+    assert dividir_filtro('{nome_empresa} contains "Little Group"') == ('nome_empresa', 'contains', 'Little Group')
+    assert dividir_filtro('{nome_empresa} contains "Page LLC"') == ('nome_empresa', 'contains', 'Page LLC')
+    assert dividir_filtro('{nome_empresa} scontains Gate Inc') == ('nome_empresa', 'contains', 'Gate Inc')
+
+
+def test_operadores_simbolicos_e_por_extenso():
+    assert dividir_filtro('{receita_anual} >= 1000') == ('receita_anual', 'ge', 1000.0)
+    assert dividir_filtro('{receita_anual} s< 10') == ('receita_anual', 'lt', 10.0)
+    assert dividir_filtro('{setor} eq "Saúde"') == ('setor', 'eq', 'Saúde')
+    assert dividir_filtro('{setor} != RH') == ('setor', 'ne', 'RH')
+
+
+def test_expressao_invalida():
+    assert dividir_filtro('receita_anual >= 10') == (None, None, None)
+    assert dividir_filtro('{receita_anual} entre 10') == (None, None, None)
+
+
+def test_aplicar_filtro_contains_com_palavra_de_operador():
+    df = pd.DataFrame({
+        'nome_empresa': ['Little Group', 'Page LLC', 'Gates Inc'],
+        'numero_funcionarios': [10, 200, 300]
+    })
+    filtrado = aplicar_filtro_tabela(df, '{nome_empresa} contains "Little Group"')
+    assert filtrado['nome_empresa'].tolist() == ['Little Group']
+
+    filtrado = aplicar_filtro_tabela(df, '{nome_empresa} contains "Page LLC" && {numero_funcionarios} ge 100')
+    assert filtrado['nome_empresa'].tolist() == ['Page LLC']